@@ -12,96 +12,214 @@
 ###########################################################
 
 import os
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import wbgapi as wb # World Bank API; they publish WDI
+from ETL.prepare_emdat import EMDAT_CSV_PATH, EMDAT_PARQUET_PATH, read_disaster_csv
+
+# Cached WDI data lives here and is refreshed once it is older than CACHE_TTL (in seconds)
+CACHE_DIR = "../data/cache"
+CACHE_TTL = 7 * 24 * 60 * 60
+
+WDI_DB = 2  # WDI is database number 2
 
 #######################################################################################################################
 #######################################################################################################################
 
-def extract_development_data(country_code, save_to_csv=False):
+def cache_is_fresh(cache_file):
     """
-    Fetch all indicators for a country and transform DataFrame into a desirable format.
+    Checks whether a cached file exists and is younger than CACHE_TTL.
+
+    Args:
+        1. cache_file (str): Path of the cached file.
+
+    Returns:
+        1. True if the cached file can be reused, False otherwise.
+    """
+    return os.path.exists(cache_file) and time.time() - os.path.getmtime(cache_file) < CACHE_TTL
+
+#######################################################################################################################
+#######################################################################################################################
+
+@functools.lru_cache(maxsize=1)
+def fetch_indicator_names():
+    """
+    Fetch the WDI series catalog once per process, persisting it to disk between runs.
+
+    Returns:
+        1. A dict mapping Indicator Code to Indicator Name, in WDI catalog order.
+        2. A Parquet file with the catalog at data/cache, keyed by WDI database (e.g., wdi_series_db2.parquet).
+    """
+    cache_name = f"wdi_series_db{WDI_DB}.parquet"
+    cache_file = os.path.join(CACHE_DIR, cache_name)
+
+    if cache_is_fresh(cache_file):
+        print(f"[EXTRACT INFO] Loading WDI Indicators from data/cache: {cache_name}")
+        series = pd.read_parquet(cache_file)
+    else:
+        print("[EXTRACT INFO] Fetching WDI Indicators from the World Bank API")
+        wb.db = WDI_DB
+        series = pd.DataFrame(
+            [(ind['id'], ind['value']) for ind in wb.series.list()],
+            columns=['Indicator Code', 'Indicator Name']
+        )
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        series.to_parquet(cache_file, index=False)
+
+    return dict(zip(series['Indicator Code'], series['Indicator Name']))
+
+#######################################################################################################################
+#######################################################################################################################
+
+def fetch_batch(country_code, batch_ids):
+    """
+    Fetch a single batch of WDI indicators for a country.
 
     Args:
         1. country_code (str): ISO3 code of the country (e.g., 'USA')
-        2. save_to_csv (bool): If True, saves the transformed DataFrame as a CSV file.
+        2. batch_ids (list): Indicator Codes to fetch.
 
     Returns:
-        1. A DataFrame: development_data.
-        2. (Optional) A CSV file with the data (e.g., USA_WDI_data.csv).
+        1. A DataFrame with years ('YR2020') as index and Indicator Codes as columns.
     """
-    try:
-        wb.db = 2  # WDI is database number 2
-        batch_size = 100  # Number of indicators to fetch per batch
+    return wb.data.DataFrame(
+        series=batch_ids,
+        economy=country_code,
+        time='all',
+        columns='series'
+    )
 
-        # In case save_to_csv = True, these save the CSV in proper directory
-        output_dir = "../data/extracted"
-        os.makedirs(output_dir, exist_ok=True)
-        output_file = os.path.join(output_dir, f"{country_code}_WDI_data.csv")
+#######################################################################################################################
+#######################################################################################################################
 
-        # Fetch Indicator Code and Indicator Name
-        indicators = list(wb.series.list())
-        indicator_names = {ind['id']: ind['value'] for ind in indicators}
+def build_development_data(country_code, max_workers=8):
+    """
+    Fetch all indicators for a country from the World Bank API and reshape them into a DataFrame.
 
-        # Fetch Country Code and Country Name
-        country_info = wb.economy.get(country_code)
-        country_name = country_info['value']
+    Args:
+        1. country_code (str): ISO3 code of the country (e.g., 'USA')
+        2. max_workers (int): Number of batches fetched concurrently (default is 8).
 
-        print(f"[EXTRACT INFO] Building DataFrame for {country_code} in batches of {batch_size} Indicators.")
-        batch_dfs = []
-        failed_batches = []
-        for i in range(0, len(indicators), batch_size):
-            batch = [ind['id'] for ind in indicators[i:i + batch_size]]
-            print(f"[EXTRACT INFO] Fetching batch {i // batch_size + 1}")
+    Returns:
+        1. A DataFrame with one row per Indicator and one column per year, or None if nothing was fetched.
+        2. A list of the batches (lists of Indicator Codes) that failed to fetch.
+    """
+    wb.db = WDI_DB
+    batch_size = 100  # Number of indicators to fetch per batch
+
+    # Fetch Indicator Code and Indicator Name (cached across calls and runs)
+    indicator_names = fetch_indicator_names()
+    indicator_codes = list(indicator_names)
+
+    # Fetch Country Code and Country Name
+    country_info = wb.economy.get(country_code)
+    country_name = country_info['value']
+
+    print(f"[EXTRACT INFO] Building DataFrame for {country_code} in batches of {batch_size} Indicators.")
+    batches = [indicator_codes[i:i + batch_size] for i in range(0, len(indicator_codes), batch_size)]
+    batch_results = [None] * len(batches)
+    failed_batches = []
+
+    # Batches are I/O-bound, so fetch them concurrently and keep results in submission order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_batch, country_code, batch): batch_num
+            for batch_num, batch in enumerate(batches)
+        }
+        for future in as_completed(futures):
+            batch_num = futures[future]
             try:
-                df_batch = wb.data.DataFrame(
-                    series=batch,
-                    economy=country_code,
-                    time='all',
-                    columns='series'
-                )
-                if not df_batch.empty:
-                    batch_dfs.append(df_batch)
+                batch_results[batch_num] = future.result()
+                print(f"[EXTRACT INFO] Fetched batch {batch_num + 1} of {len(batches)}")
             except Exception as e:
-                failed_batches.append(batch)
-                print(f"[EXTRACT ERROR] Failed to fetch batch {i // batch_size + 1}: {e}")
+                failed_batches.append(batches[batch_num])
+                print(f"[EXTRACT ERROR] Failed to fetch batch {batch_num + 1}: {e}")
 
-        if not batch_dfs:
-            print("[EXTRACT ERROR] No data fetched. DataFrame and CSV not created.")
-            return None
+    batch_dfs = [df for df in batch_results if df is not None and not df.empty]
 
-        # Combine the batches
-        combined_df = pd.concat(batch_dfs, axis=1)
+    if not batch_dfs:
+        return None, failed_batches
 
-        # Reset index to facilitate getting years as columns
-        combined_df.reset_index(inplace=True)
+    # Order the union of years numerically, stripping 'YR2020' to '2020' once on this short index
+    all_times = pd.Index(list(set().union(*[df.index for df in batch_dfs])), name='time')
+    all_times = all_times[np.argsort(all_times.str.slice(2).astype(int))]
+    year_cols = list(all_times.str.slice(2))
 
-        # Melt the DataFrame to get Indicators as rows
-        melted_df = combined_df.melt(
-            id_vars=['time'],
-            var_name='Indicator Code',
-            value_name='Value'
-        )
+    # Combine the batches: align every batch to the union of years once, then stack the
+    # underlying arrays side by side (avoids pd.concat's per-frame index alignment)
+    batch_dfs = [df.reindex(all_times) for df in batch_dfs]
+    combined_df = pd.DataFrame(
+        np.hstack([df.to_numpy() for df in batch_dfs]),
+        index=year_cols,
+        columns=np.concatenate([df.columns.values for df in batch_dfs])
+    )
+
+    # Transpose to get Indicators as rows and years as columns
+    final_df = combined_df.T.sort_index()
+    final_df.index.name = 'Indicator Code'
+    final_df = final_df.reset_index()
+
+    # Add Country Name and Indicator Name columns to final DF
+    final_df.insert(0, 'Country Name', country_name)
+    final_df.insert(1, 'Country Code', country_code)
+    final_df.insert(2, 'Indicator Name', final_df['Indicator Code'].map(indicator_names))
+
+    # Order columns (years are already chronological)
+    ordered_cols = ['Country Name', 'Country Code', 'Indicator Name', 'Indicator Code'] + year_cols
+    final_df = final_df[ordered_cols]
+
+    # Keep the year columns with the DataFrame so later stages don't have to rediscover them
+    final_df.attrs['year_cols'] = year_cols
+
+    return final_df, failed_batches
+
+#######################################################################################################################
+#######################################################################################################################
+
+def extract_development_data(country_code, save_to_csv=False, max_workers=8, use_cache=True):
+    """
+    Fetch all indicators for a country and transform DataFrame into a desirable format.
 
-        # Convert time format from 'YR2020' to '2020'
-        melted_df['time'] = melted_df['time'].str[2:]
+    Args:
+        1. country_code (str): ISO3 code of the country (e.g., 'USA')
+        2. save_to_csv (bool): If True, saves the transformed DataFrame as a CSV file.
+        3. max_workers (int): Number of batches fetched concurrently (default is 8).
+        4. use_cache (bool): If True, reuses a cached extract younger than CACHE_TTL instead of calling the API.
 
-        # Pivot to get years as columns
-        final_df = melted_df.pivot(
-            index='Indicator Code',
-            columns='time',
-            values='Value'
-        ).reset_index()
+    Returns:
+        1. A DataFrame: development_data.
+        2. (Optional) A CSV file with the data (e.g., USA_WDI_data.csv).
+        3. A Parquet cache of the data at data/cache (e.g., USA_WDI_data.parquet).
+    """
+    try:
+        # In case save_to_csv = True, these save the CSV in proper directory
+        output_dir = "../data/extracted"
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, f"{country_code}_WDI_data.csv")
+        cache_file = os.path.join(CACHE_DIR, f"{country_code}_WDI_data.parquet")
 
-        # Add Country Name and Indicator Name columns to melted DF
-        final_df.insert(0, 'Country Name', country_name)
-        final_df.insert(1, 'Country Code', country_code)
-        final_df.insert(2, 'Indicator Name', final_df['Indicator Code'].map(indicator_names))
+        if use_cache and cache_is_fresh(cache_file):
+            print(f"[EXTRACT INFO] Loading cached WDI data for {country_code} from data/cache: "
+                  f"{country_code}_WDI_data.parquet")
+            final_df = pd.read_parquet(cache_file)
+        else:
+            final_df, failed_batches = build_development_data(country_code, max_workers)
+            if final_df is None:
+                print("[EXTRACT ERROR] No data fetched. DataFrame and CSV not created.")
+                return None
 
-        # Sort columns so years are in chronological order
-        year_cols = [col for col in final_df.columns if col.isdigit()]
-        ordered_cols = ['Country Name', 'Country Code', 'Indicator Name', 'Indicator Code'] + sorted(year_cols)
-        final_df = final_df[ordered_cols]
+            # Only a complete extract is cached; a partial one would hide the failed batches for CACHE_TTL
+            if failed_batches:
+                print(f"[EXTRACT ERROR] {len(failed_batches)} batch(es) failed for {country_code}; "
+                      f"cache at data/cache: {country_code}_WDI_data.parquet not updated")
+            else:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                final_df.to_parquet(cache_file, index=False)
 
         # Save to CSV if requested
         if save_to_csv:
@@ -135,12 +253,35 @@ def extract_disaster_data(country_code, save_to_csv=False):
         2. (Optional) A CSV file with the data (e.g., USA_EMDAT_data.csv).
     """
     try:
-        disaster_file_path = "../data/raw/EMDAT_complete.csv"
-        if not os.path.exists(disaster_file_path):
-            raise FileNotFoundError(f"[EXTRACT ERROR] EM-DAT file not found at {disaster_file_path}")
+        disaster_file_path = EMDAT_CSV_PATH
+        disaster_parquet_path = EMDAT_PARQUET_PATH
+
+        # The Parquet written by prepare_emdat.py is only trusted if it is at least as new as the CSV
+        parquet_is_current = os.path.exists(disaster_parquet_path) and (
+            not os.path.exists(disaster_file_path)
+            or os.path.getmtime(disaster_parquet_path) >= os.path.getmtime(disaster_file_path)
+        )
+
+        if parquet_is_current:
+            # Only row groups containing the ISO are read
+            disaster_data = pq.read_table(
+                disaster_parquet_path,
+                filters=[('ISO', '=', country_code)]
+            ).to_pandas()
+        else:
+            if not os.path.exists(disaster_file_path):
+                raise FileNotFoundError(f"[EXTRACT ERROR] EM-DAT file not found at {disaster_file_path}")
+
+            if os.path.exists(disaster_parquet_path):
+                print("[EXTRACT INFO] EM-DAT Parquet is older than EMDAT_complete.csv; reading the CSV instead. "
+                      "Rerun ETL/prepare_emdat.py to refresh it")
+            else:
+                print("[EXTRACT INFO] EM-DAT Parquet not found; run ETL/prepare_emdat.py to skip CSV parsing")
 
-        disaster_data = pd.read_csv(disaster_file_path)
-        disaster_data = disaster_data[disaster_data['ISO'] == country_code]
+            # Parse with Arrow and filter on ISO before converting, so only the
+            # country's rows are ever materialized as a pandas DataFrame
+            disaster_table = read_disaster_csv(disaster_file_path)
+            disaster_data = disaster_table.filter(pc.equal(disaster_table['ISO'], country_code)).to_pandas()
 
         if disaster_data.empty:
             print(f"[EXTRACT ERROR] Error finding EM-DAT data for ISO: {country_code}")
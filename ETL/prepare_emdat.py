@@ -0,0 +1,77 @@
+##########################################################
+# Name:    prepare_emdat.py
+# Author:  Alexander X. Gonzalez-Torres
+# Purpose: One-time conversion of the raw EM-DAT CSV into
+#          a Parquet file sorted by ISO, so extract.py can
+#          read a single country's rows without parsing the
+#          whole global table on every run.
+#
+# Usage: Run once (and again whenever EMDAT_complete.csv is
+#        updated) from the ETL directory:
+#            python prepare_emdat.py
+#        extract_disaster_data falls back to the CSV when
+#        the Parquet file does not exist or is older than it.
+###########################################################
+
+import os
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+EMDAT_CSV_PATH = "../data/raw/EMDAT_complete.csv"
+EMDAT_PARQUET_PATH = "../data/raw/EMDAT_complete.parquet"
+
+#######################################################################################################################
+#######################################################################################################################
+
+def read_disaster_csv(csv_path=EMDAT_CSV_PATH):
+    """
+    Parses the raw EM-DAT CSV with pyarrow. Shared by prepare_disaster_data and extract.py, so the
+    Parquet file and the CSV fallback always parse the data the same way.
+
+    Args:
+        1. csv_path (str): Path of the EM-DAT CSV (default is data/raw/EMDAT_complete.csv).
+
+    Returns:
+        1. A pyarrow Table with the EM-DAT data.
+    """
+    # strings_can_be_null keeps empty text cells missing (as pd.read_csv does) instead of ''
+    return pacsv.read_csv(
+        csv_path,
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+    )
+
+#######################################################################################################################
+#######################################################################################################################
+
+def prepare_disaster_data(row_group_size=1000):
+    """
+    Converts the raw EM-DAT CSV into a Parquet file sorted by ISO.
+
+    Args:
+        1. row_group_size (int): Rows per Parquet row group (default is 1,000). Smaller row groups
+           let ISO filters skip more of the file.
+
+    Returns:
+        1. A Parquet file with the EM-DAT data at data/raw: EMDAT_complete.parquet.
+    """
+    try:
+        if not os.path.exists(EMDAT_CSV_PATH):
+            raise FileNotFoundError(f"[PREPARE ERROR] EM-DAT file not found at {EMDAT_CSV_PATH}")
+
+        # Sorting by ISO keeps each country in as few row groups as possible,
+        # so row group statistics can prune everything else when reading
+        disaster_table = read_disaster_csv().sort_by('ISO')
+        pq.write_table(disaster_table, EMDAT_PARQUET_PATH, row_group_size=row_group_size)
+
+        print(f"[PREPARE INFO] Creating a Parquet file with {disaster_table.num_rows} EM-DAT records "
+              f"at data/raw: EMDAT_complete.parquet")
+
+    except Exception as e:
+        print(f"[PREPARE ERROR] Error executing prepare_disaster_data: {e}")
+        raise
+
+#######################################################################################################################
+#######################################################################################################################
+
+if __name__ == "__main__":
+    prepare_disaster_data()
@@ -14,6 +14,9 @@
 
 
 import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 #######################################################################################################################
 #######################################################################################################################
@@ -43,31 +46,22 @@ def transform_development_data(
 
     """
     try:
-        development_data_transformed = development_data.copy()
-
-        development_data_transformed = development_data_transformed.loc[:,
-                                    ['Country Code', 'Indicator Name'] +
-                                    [str(year) for year in range(df_min_year, df_max_year + 1)]
-                                    ]
+        # Slice the selected years straight into one NumPy buffer; every filter below works on it.
+        # float32 is plenty for WDI values and halves the bytes moved through interpolation and plotting
+        year_cols = [str(year) for year in range(df_min_year, df_max_year + 1)]
+        year_values = development_data[year_cols].to_numpy(dtype=np.float32)
         print(f"[TRANSFORM INFO] Filtering {country_code} WDI data to only include data between {df_min_year} "
               f"and {df_max_year}")
 
-    # Eliminates Development Indicators where more than half of the years have no data
-    # There has to be a more elegant way of doing this. I don't love the create-and-delete column process.
+    # Eliminates Development Indicators where more than half of the years have no data,
+    # and Indicators where all year columns contain 0s, using a single boolean mask
      # Also, "more than half of the years" doesn't feel sensitive enough, but we can come back to this
-        num_year_columns = development_data_transformed.iloc[:, 2:].shape[1]
-        nc_half = num_year_columns // 2
-
-        development_data_transformed['NaN_count'] = development_data_transformed.iloc[:, 2:].isna().sum(axis=1)
-        development_data_transformed = development_data_transformed[
-            development_data_transformed['NaN_count'] <= nc_half
-            ]
-        development_data_transformed = development_data_transformed.drop(columns=['NaN_count'])
+        nc_half = year_values.shape[1] // 2
 
-    # Eliminate rows where all year columns contain 0s
-        development_data_transformed = development_data_transformed[
-            ~(development_data_transformed.iloc[:, 2:] == 0).all(axis=1)
-        ]
+        # any() is a logical_or reduction straight over the floats (NaN counts as nonzero),
+        # so a row is all 0s exactly when any() is False; no (year_values == 0) temporary needed
+        keep = (np.isnan(year_values).sum(axis=1) <= nc_half) & year_values.any(axis=1)
+        year_values = year_values[keep]
 
         print(f'[TRANSFORM INFO] Filtering {country_code} WDI data to only include '
               f'Indicators with data for 50% or more of selected years')
@@ -76,17 +70,34 @@ def transform_development_data(
     # 1. Backward Fill for minimum year in DataFrame ('bfill')
     # 2. Forward Fill for maximum year in DataFrame ('ffill')
     # 3. Linear Interpolation for NULL values between two valid data points ('linear')
-        if development_data_transformed.iloc[:, 2:].isna().any().any():
-            development_data_transformed.iloc[:, 2:] = (
-            development_data_transformed.iloc[:, 2:]
-            .interpolate(axis=1, method='linear')
-            .bfill(axis=1)
-            .ffill(axis=1)
-        )
+    # Only rows that actually contain NULL values go through the interpolation chain
+        row_has_nan = np.isnan(year_values).any(axis=1)
+        if row_has_nan.any():
+            year_values[row_has_nan] = (
+                pd.DataFrame(year_values[row_has_nan])
+                .interpolate(axis=1, method='linear')
+                .bfill(axis=1)
+                .ffill(axis=1)
+                .to_numpy()
+            )
             print(f'[TRANSFORM INFO] Handling NULL values for {country_code} WDI data')
         else:
             print(f'[TRANSFORM INFO] No NULL values found for {country_code} WDI data; skipping NULL handling')
 
+        # Build the transformed DataFrame once, from the surviving rows only
+        development_data_transformed = pd.DataFrame(
+            year_values,
+            index=development_data.index[keep],
+            columns=year_cols
+        )
+        # Text columns are Arrow-backed strings rather than Python objects
+        arrow_string = pd.ArrowDtype(pa.string())
+        development_data_transformed.insert(
+            0, 'Country Code', pd.array(development_data['Country Code'].to_numpy()[keep], dtype=arrow_string))
+        development_data_transformed.insert(
+            1, 'Indicator Name', pd.array(development_data['Indicator Name'].to_numpy()[keep], dtype=arrow_string))
+        development_data_transformed.attrs['year_cols'] = year_cols
+
     # Save to CSV if specified
         if save_to_csv:
             os.makedirs("../data/transformed", exist_ok=True)
@@ -12,13 +12,76 @@
 ###########################################################
 
 import os
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; pages are only ever written to PDF, never shown
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
+from pypdf import PdfWriter
 import seaborn as sns
-import itertools
 
-def generate_report(country_code, dev_data, dis_data):
+def render_indicator_pages(page_file, country_code, year_cols, indicator_names, indicator_values, annotations):
+    """
+    Renders one page per indicator into a standalone PDF. Runs in a worker process for generate_report.
+
+    Args:
+        1. page_file (str): Path of the PDF to write.
+        2. country_code (str): ISO3 code of the country (e.g., 'USA')
+        3. year_cols (list): Year labels for the x-axis.
+        4. indicator_names (np.ndarray): Indicator Names, one per page.
+        5. indicator_values (np.ndarray): Values for every year in year_cols, one row per page.
+        6. annotations (list): (year, storm, label suffix, color) for every Hurricane marker.
+
+    Returns:
+        1. The number of indicators in this chunk.
+    """
+    # One figure is reused for every indicator; its axes are cleared between pages
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    with PdfPages(page_file) as pdf:
+        # loop through the indicators 
+        for indicator_name, values in zip(indicator_names, indicator_values):
+            try:
+                # Reset the axes for current indicator
+                ax.clear()
+                ax.plot(year_cols, values, marker='o')
+
+                # Unique markers for Hurricanes in vistool
+                for year, storm, label_suffix, color in annotations:
+                    ax.axvline(
+                        x=year,
+                        color=color,
+                        linestyle='--',
+                        alpha=0.7,
+                        label=f"{storm}{label_suffix}"
+                    )
+
+                # Vistool customization 
+                ax.set_title(f"{country_code}: {indicator_name}")
+                ax.set_xlabel("Year")
+                ax.set_ylabel("Value")
+                ax.tick_params(axis='x', labelrotation=45)
+                ax.grid(True)
+                ax.legend(loc='upper left', fontsize=8)
+                fig.tight_layout()
+
+                # Save current figure to PDF
+                pdf.savefig(fig)
+
+            except Exception as e:
+                print(f"[TIMESERIES ERROR] Failed to plot indicator {indicator_name}: {e}")
+                continue
+
+    plt.close(fig)
+    return len(indicator_names)
+
+#######################################################################################################################
+#######################################################################################################################
+
+def generate_report(country_code, dev_data, dis_data, max_workers=None):
     """
     Generates a time series analysis report for all indicators and saves to a PDF.
 
@@ -26,6 +89,7 @@ def generate_report(country_code, dev_data, dis_data):
         1. country_code (str): ISO3 code of the country (e.g., 'USA')
         2. dev_data (pd.DataFrame): Transformed development data for the country.
         3. dis_data (pd.DataFrame): Transformed disaster data for the country.
+        4. max_workers (int): Number of processes rendering pages (default is one per CPU).
 
     Returns:
         1. A .pdf report with time series graphics for every Indicator in dev_data.
@@ -36,10 +100,11 @@ def generate_report(country_code, dev_data, dis_data):
         os.makedirs(output_dir, exist_ok=True)
         output_file = os.path.join(output_dir, f"{country_code}_timeseries_report.pdf")
 
-        # Helps with progress monitoring
+        # Helps with progress monitoring; also the number of indicators rendered per worker task
         batch_size = 100
 
-        year_cols = [col for col in dev_data.columns if col.isdigit()]
+        # Year columns are recorded by transform.py; fall back to scanning for DataFrames loaded from CSV
+        year_cols = dev_data.attrs.get('year_cols') or [col for col in dev_data.columns if col.isdigit()]
         min_year = int(min(year_cols))
         max_year = int(max(year_cols))
 
@@ -47,66 +112,68 @@ def generate_report(country_code, dev_data, dis_data):
         print(f"[TIMESERIES INFO] {total_indicators} meaningful indicators found "
               f"for {country_code} between {min_year} and {max_year}")
 
-        # Generate distinct colors for every Hurricane in the vistools 
-        n_storms = len(dis_data['Event Name'].unique())
-        storm_colors = itertools.cycle(sns.color_palette("husl", n_colors=n_storms))
-
-        # Create the PDF report 
-        with PdfPages(output_file) as pdf:
-            # loop through the indicators 
-            for i, row in enumerate(dev_data.iterrows(), start=1):
-                indicator_name = row[1]['Indicator Name']
-                values = row[1][year_cols].values
-
-                if i % batch_size == 0 or i == total_indicators:
-                    print(f"[TIMESERIES INFO] Progress: {i} of {total_indicators} Indicators analyzed")
-
-                if pd.isna(values).all():
-                    print(f"[TIMESERIES WARNING] Skipping indicator '{indicator_name}' due to missing data")
-                    continue
-
-                try:
-                    # Create a figure for current indicator 
-                    plt.figure(figsize=(10, 6))
-                    plt.plot(year_cols, values, marker='o')
-
-                    # Unique markers for Hurricanes in vistool, plus 
-                    # Marking if a foreign country received US support post-disaster (maybe keep, maybe don't -- ALEX) 
-                    disaster_years = dis_data['Start Year'].values
-                    disaster_names = dis_data['Event Name'].values
-                    ofda_support = dis_data['OFDA/BHA Response'].values
-                    
-                    for year, storm, ofda in zip(disaster_years, disaster_names, ofda_support):
-                        if str(year) in year_cols:
-                            color = next(storm_colors) 
-                            # Exclude OFDA/BHA annotations for Puerto Rico and the U.S.
-                            label_suffix = "" if country_code in ["PRI", "USA"] else f" ({'US Response' if ofda == 'Yes' else 'No US Response'})"
-                            plt.axvline(
-                                x=str(year),
-                                color=color,
-                                linestyle='--',
-                                alpha=0.7,
-                                label=f"{storm}{label_suffix}"
-                            )
-
-                    # Vistool customization 
-                    plt.title(f"{country_code}: {indicator_name}")
-                    plt.xlabel("Year")
-                    plt.ylabel("Value")
-                    plt.xticks(rotation=45)
-                    plt.grid(True)
-                    plt.legend(loc='upper left', fontsize=8)
-                    plt.tight_layout()
-
-                    # Save current figure to PDF
-                    pdf.savefig()
-                    plt.close()
-
-                except Exception as e:
-                    print(f"[TIMESERIES ERROR] Failed to plot indicator {indicator_name}: {e}")
-                    continue
-
-            print(f"[TIMESERIES INFO] Saved timeseries report for {country_code} at data/timeseries_reports: {country_code}_timeseries_report.pdf")
+        # Generate one distinct color per Hurricane in the vistools, so a storm keeps its color on every page
+        # (factorize maps each Event Name, including a missing one, to an index into the palette)
+        storm_codes, storm_names = pd.factorize(dis_data['Event Name'], use_na_sentinel=False)
+        storm_palette = sns.color_palette("husl", n_colors=len(storm_names))
+
+        # Disaster annotations are the same on every page, so build them once:
+        # (year, storm, label suffix, color) for every disaster within the report's years
+        # Marking if a foreign country received US support post-disaster (maybe keep, maybe don't -- ALEX)
+        year_set = set(year_cols)
+        annotations = []
+        for year, storm, storm_code, ofda in zip(dis_data['Start Year'].values,
+                                                 dis_data['Event Name'].values,
+                                                 storm_codes,
+                                                 dis_data['OFDA/BHA Response'].values):
+            if str(year) in year_set:
+                # Exclude OFDA/BHA annotations for Puerto Rico and the U.S.
+                label_suffix = "" if country_code in ["PRI", "USA"] else f" ({'US Response' if ofda == 'Yes' else 'No US Response'})"
+                annotations.append((str(year), storm, label_suffix, storm_palette[storm_code]))
+
+        # Pull names and values out as arrays once instead of building a Series per row
+        indicator_names = dev_data['Indicator Name'].to_numpy()
+        indicator_values = dev_data[year_cols].to_numpy()
+
+        # Skip indicators with no data at all up front rather than checking inside the loop
+        has_data = ~pd.isna(indicator_values).all(axis=1)
+        for indicator_name in indicator_names[~has_data]:
+            print(f"[TIMESERIES WARNING] Skipping indicator '{indicator_name}' due to missing data")
+        indicator_names = indicator_names[has_data]
+        indicator_values = indicator_values[has_data]
+        total_plots = len(indicator_names)
+
+        # Render chunks of indicators into separate PDFs in worker processes,
+        # then merge the chunks in order into the final report
+        chunks = [
+            (indicator_names[start:start + batch_size], indicator_values[start:start + batch_size])
+            for start in range(0, total_plots, batch_size)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            chunk_files = [os.path.join(tmp_dir, f"chunk_{n}.pdf") for n in range(len(chunks))]
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                rendered = executor.map(
+                    render_indicator_pages,
+                    chunk_files,
+                    itertools.repeat(country_code),
+                    itertools.repeat(year_cols),
+                    [names for names, _ in chunks],
+                    [values for _, values in chunks],
+                    itertools.repeat(annotations)
+                )
+                done = 0
+                for n_indicators in rendered:
+                    done += n_indicators
+                    print(f"[TIMESERIES INFO] Progress: {done} of {total_plots} Indicators analyzed")
+
+            report = PdfWriter()
+            for chunk_file in chunk_files:
+                report.append(chunk_file)
+            report.write(output_file)
+
+        print(f"[TIMESERIES INFO] Saved timeseries report for {country_code} at data/timeseries_reports: {country_code}_timeseries_report.pdf")
 
     except Exception as e:
         print(f"[TIMESERIES ERROR] Error generating report for {country_code}: {e}")